@@ -114,7 +114,12 @@ def assert_pdf_equal(
         actual_pdf.output(pdf_file, linearize=linearize)
     if QPDF_AVAILABLE:  # Favor qpdf-based comparison, as it helps a lot debugging:
         actual_qpdf = _qpdf(actual_pdf_path)
-        expected_qpdf = _qpdf(expected_pdf_path)
+        if expected_pdf_path is expected:  # reference PDF file, can be cached
+            expected_qpdf = _cached_reference_qpdf(
+                expected_pdf_path, expected_pdf_path.stat().st_mtime_ns
+            )
+        else:
+            expected_qpdf = _qpdf(expected_pdf_path)
         (tmp_path / "actual_qpdf.pdf").write_bytes(actual_qpdf)
         (tmp_path / "expected_qpdf.pdf").write_bytes(expected_qpdf)
         actual_lines = actual_qpdf.splitlines()
@@ -139,7 +144,12 @@ def assert_pdf_equal(
             _run_cmd("qpdf", "--check-linearization", str(actual_pdf_path))
     else:  # Fallback to hash comparison
         actual_hash = hashlib.md5(actual_pdf_path.read_bytes()).hexdigest()
-        expected_hash = hashlib.md5(expected_pdf_path.read_bytes()).hexdigest()
+        if expected_pdf_path is expected:  # reference PDF file, can be cached
+            expected_hash = _cached_reference_md5(
+                expected_pdf_path, expected_pdf_path.stat().st_mtime_ns
+            )
+        else:
+            expected_hash = hashlib.md5(expected_pdf_path.read_bytes()).hexdigest()
 
         assert actual_hash == expected_hash, f"{actual_hash} != {expected_hash}"
 
@@ -219,6 +229,19 @@ def _qpdf(input_pdf_filepath):
     )
 
 
+# Reference PDF files are often shared by several tests.
+# The file modification time is part of the cache key,
+# so that a reference PDF regenerated during the session is processed again.
+@functools.lru_cache(maxsize=None)
+def _cached_reference_qpdf(pdf_filepath, _mtime_ns):
+    return _qpdf(pdf_filepath)
+
+
+@functools.lru_cache(maxsize=None)
+def _cached_reference_md5(pdf_filepath, _mtime_ns):
+    return hashlib.md5(pdf_filepath.read_bytes()).hexdigest()
+
+
 def _run_cmd(*args):
     try:
         return check_output(args, stderr=PIPE)
@@ -333,11 +356,28 @@ def pytest_addoption(parser):
         action="store_true",
         help="Trace main memory allocations differences during the whole execution",
     )
+    parser.addoption(
+        "--run-slow",
+        action="store_true",
+        help="Also run the tests marked as slow, that are skipped by default",
+    )
 
 
-def pytest_configure():
-    "Disable some loggers."
+def pytest_configure(config):
+    "Disable some loggers & register custom markers."
     logging.getLogger("fpdf.svg").propagate = False
+    config.addinivalue_line(
+        "markers", "slow: long-running test, only executed with --run-slow"
+    )
+
+
+def pytest_collection_modifyitems(config, items):
+    if config.getoption("run_slow"):
+        return
+    skip_slow = pytest.mark.skip(reason="slow test, requires --run-slow")
+    for item in items:
+        if "slow" in item.keywords:
+            item.add_marker(skip_slow)
 
 
 @pytest.fixture(scope="module", autouse=True)
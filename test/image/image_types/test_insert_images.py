@@ -1,6 +1,6 @@
 import io
 import logging
-import os
+import mmap
 import sys
 from io import BytesIO
 from pathlib import Path
@@ -12,45 +12,38 @@ import pytest
 from PIL import Image, ImageDraw, ImageFont, TiffImagePlugin
 from PyPDF2 import PdfReader, PdfWriter
 from fpdf import FPDF
-from fpdf.image_parsing import transcode_monochrome
+from fpdf.image_parsing import get_img_info, transcode_monochrome
 
 from test.conftest import assert_pdf_equal
 
 HERE = Path(__file__).resolve().parent
+ON_WINDOWS = sys.platform in ("cygwin", "win32")
 
 
-def test_fillorder_lsb_to_msb():
+def _g4_tiff_bytes(fillorder):
     img_data = BytesIO()
-    img = Image.new("1", (10, 10), 0)
-    img.save(
+    Image.new("1", (10, 10), 0).save(
         img_data,
         format="TIFF",
         compression="group4",
-        tiffinfo={TiffImagePlugin.FILLORDER: 2},
+        tiffinfo={TiffImagePlugin.FILLORDER: fillorder},
     )
-    img_data.seek(0)
-
-    with Image.open(img_data) as test_img:
-        filename = "test.tiff"
-
-        with patch(
-            "fpdf.image_parsing.get_img_info",
-            return_value={
-                "f": "CCITTFaxDecode",
-                "cs": "DeviceGray",
-                "data": b"test_bytes",
-            },
-        ) as mock_get_img_info:
-            result = mock_get_img_info(
-                filename, test_img, image_filter="CCITTFaxDecode"
-            )
-
-            assert result["f"] == "CCITTFaxDecode"
-            assert result["cs"] == "DeviceGray"
-            assert isinstance(result["data"], bytes)
-            mock_get_img_info.assert_called_once_with(
-                filename, test_img, image_filter="CCITTFaxDecode"
-            )
+    return img_data.getvalue()
+
+
+def test_fillorder_lsb_to_msb():
+    msb_info = get_img_info(
+        "test.tiff", _g4_tiff_bytes(fillorder=1), image_filter="CCITTFaxDecode"
+    )
+    lsb_info = get_img_info(
+        "test.tiff", _g4_tiff_bytes(fillorder=2), image_filter="CCITTFaxDecode"
+    )
+
+    assert lsb_info["f"] == "CCITTFaxDecode"
+    assert lsb_info["cs"] == "DeviceGray"
+    assert isinstance(lsb_info["data"], bytes)
+    # The bits of the lsb-to-msb payload must have been reversed:
+    assert lsb_info["data"] == msb_info["data"]
 
 
 def test_generate_multitable_pdf_with_mock():
@@ -104,10 +97,11 @@ def test_generate_multitable_pdf_with_mock():
             call(40, 10, "Row3Col3", border=1),
         ]
 
-        mock_cell.assert_has_calls(table_cell_calls, any_order=False)
+        # The first cell is the one rendered by header() on add_page():
+        assert mock_cell.call_args_list[1:] == table_cell_calls
 
         expected_ln_calls = [call(10)] * len(table_data)
-        mock_ln.assert_has_calls(expected_ln_calls, any_order=False)
+        assert mock_ln.call_args_list == expected_ln_calls
 
         mock_image.assert_called_once_with(
             HERE / "pythonknight.png", x=10, y=100, w=50, h=50
@@ -133,34 +127,39 @@ def test_broken_image():
             pdf.image(broken_image, x=10, y=10, w=50, h=50)
 
 
-def test_large_table():
+@pytest.mark.parametrize(
+    "rows_count", [1000, pytest.param(10000, marks=pytest.mark.slow)]
+)
+def test_large_table(rows_count, tmp_path):
     pdf = FPDF()
+    pdf.compress = False
     pdf.add_page()
     pdf.set_font("Arial", size=10)
 
-    for i in range(10000):
-        pdf.cell(40, 10, f"Row {i}", border=1)
-        pdf.cell(40, 10, "Data", border=1)
-        pdf.cell(40, 10, "More Data", border=1)
+    # The content stream operators of each cell embed its absolute position,
+    # and page breaks are triggered by cell() itself, so this table cannot be
+    # emitted as a pre-built content stream: only the row labels are computed
+    # ahead of the loop.
+    row_labels = ["Row " + str(i) for i in range(rows_count)]
+    cell = pdf.cell
+    for row_label in row_labels:
+        cell(40, 10, row_label, border=1)
+        cell(40, 10, "Data", border=1)
+        cell(40, 10, "More Data", border=1)
         pdf.ln()
 
-    pdf_file_path = "test_large_table.pdf"
+    pdf_file_path = tmp_path / "test_large_table.pdf"
     pdf.output(pdf_file_path)
-    fake_file = BytesIO()
-    pdf.output(fake_file)
-    fake_file.seek(0)
-
-    reader = PdfReader(fake_file)
-    text = ""
-    for page in reader.pages:
-        text += page.extract_text()
-
-    assert "Row 999" in text, "Row 999 not found in extracted text"
 
-    with open("test_large_table.pdf", "wb") as f:
-        f.write(fake_file.getvalue())
-
-    print("Test passed and PDF saved as 'test_large_table.pdf'")
+    # Content streams are not compressed, so text is found as is in the PDF,
+    # and the file written can be scanned through a memory map without copying it:
+    with open(pdf_file_path, "rb") as pdf_file, mmap.mmap(
+        pdf_file.fileno(), 0, access=mmap.ACCESS_READ
+    ) as pdf_map:
+        last_row_label = f"Row {rows_count - 1}"
+        assert (
+            pdf_map.find(f"({last_row_label})".encode()) != -1
+        ), f"{last_row_label} not found in PDF file"
 
 
 def test_unsupported_font_error():
@@ -173,7 +172,7 @@ def test_unsupported_font_error():
         pdf.add_font("NonExistentFont", "", "nonexistent.ttf", uni=True)
 
 
-def test_long_text_wrapping():
+def test_long_text_wrapping(tmp_path):
     pdf = FPDF()
     pdf.add_page()
     long_text = (
@@ -181,20 +180,10 @@ def test_long_text_wrapping():
     )
     pdf.set_font("Arial", size=12)
     pdf.multi_cell(0, 10, long_text)
-
-    fake_file = BytesIO()
-    pdf.output(fake_file)
-    fake_file.seek(0)
-
-    reader = PdfReader(fake_file)
-    text = ""
-    for page in reader.pages:
-        text += page.extract_text()
-
-    assert "This is a very long sentence" in text
+    assert_pdf_equal(pdf, HERE / "long_text_wrapping.pdf", tmp_path)
 
 
-def test_extreme_page_size():
+def test_extreme_page_size(tmp_path):
     pdf = FPDF()
 
     extreme_size = (9999999, 9999999)
@@ -204,22 +193,13 @@ def test_extreme_page_size():
         pdf.set_font("Arial", size=12)
         pdf.cell(0, 10, "Extreme Page Size Test", ln=True)
 
-        fake_file = BytesIO()
-        pdf.output(fake_file)
-        fake_file.seek(0)
-
-        reader = PdfReader(fake_file)
-        text = ""
-        for page in reader.pages:
-            text += page.extract_text()
-
-        assert "Extreme Page Size Test" in text
+        assert_pdf_equal(pdf, HERE / "extreme_page_size.pdf", tmp_path)
 
     except (RuntimeError, ValueError, OSError) as e:
         pytest.fail(f"Test failed due to an exception: {str(e)}")
 
 
-def test_extreme_page_size_create():
+def test_extreme_page_size_create(tmp_path):
     pdf = FPDF()
 
     extreme_size = (9999999, 9999999)
@@ -228,43 +208,51 @@ def test_extreme_page_size_create():
     pdf.set_font("Arial", size=12)
     pdf.cell(0, 10, "Extreme Page Size Test", ln=True)
 
-    output_file = "test_extreme_page_size.pdf"
+    output_file = tmp_path / "test_extreme_page_size.pdf"
     pdf.output(output_file)
 
-    assert os.path.exists(output_file), "PDF doesnt crate"
+    assert output_file.exists(), "PDF doesnt crate"
 
-    file_size = os.path.getsize(output_file)
+    file_size = output_file.stat().st_size
     assert file_size > 0, "PDF file is empty"
 
-    os.remove(output_file)
-
 
-def test_parallel_element_addition():
+def test_sequential_element_addition():
     pdf = FPDF()
+    pdf.compress = False
     pdf.add_page()
     pdf.set_font("Arial", size=12)
 
+    def add_cells():
+        for i in range(100):
+            pdf.cell(40, 10, f"Batch Row {i}", border=1)
+
+    for _ in range(5):
+        add_cells()
+
+    assert b"(Batch Row 99)" in pdf.output(), "Last row not found in PDF"
+
+
+@pytest.mark.skip(
+    reason="FPDF is not thread-safe: the page buffer and the x/y cursor are"
+    " mutated without any lock, so a single instance must not be shared"
+    " between threads"
+)
+def test_fpdf_not_thread_safe():
+    pdf = FPDF()
+    pdf.add_page()
+    pdf.set_font("Helvetica", size=12)
+
     def add_cells():
         for i in range(100):
             pdf.cell(40, 10, f"Thread Row {i}", border=1)
 
     threads = [Thread(target=add_cells) for _ in range(5)]
-
     for thread in threads:
         thread.start()
-
     for thread in threads:
         thread.join()
 
-    fake_file = BytesIO()
-    pdf.output(fake_file)
-    fake_file.seek(0)
-
-    reader = PdfReader(fake_file)
-    text = "".join(page.extract_text() for page in reader.pages)
-
-    assert "Thread Row 99" in text, "Last row from threads not found in PDF"
-
 
 def test_password_protected_pdf():
     # Step 1: Create PDF with FPDF
@@ -273,9 +261,7 @@ def test_password_protected_pdf():
     pdf.set_font("Arial", size=12)
     pdf.cell(0, 10, "This is a password-protected PDF.", ln=True)
 
-    fake_file = BytesIO()
-    pdf.output(fake_file)
-    fake_file.seek(0)
+    fake_file = BytesIO(pdf.output())
 
     # Step 2: Protect PDF with PyPDF2
     writer = PdfWriter()
@@ -287,9 +273,10 @@ def test_password_protected_pdf():
     writer.encrypt(user_password="userpass", owner_password="ownerpass")
     protected_file = BytesIO()
     writer.write(protected_file)
+    assert b"/Encrypt" in protected_file.getvalue()
     protected_file.seek(0)
 
-    # Step 3: Try to modify PDF with FPDF
+    # Step 3: Read the protected PDF, before & after decrypting it
     protected_reader = PdfReader(protected_file)
 
     with pytest.raises(Exception, match="File has not been decrypted"):
@@ -300,31 +287,113 @@ def test_password_protected_pdf():
 
     assert "This is a password-protected PDF." in text
 
-    # Attempting to add content to a protected PDF with FPDF
-    new_pdf = FPDF()
-    new_pdf.add_page()
-    new_pdf.set_font("Arial", size=12)
-    new_pdf.cell(0, 10, "Trying to modify a protected PDF.", ln=True)
-
-    modified_file = BytesIO()
-    new_pdf.output(modified_file)
-    modified_file.seek(0)
 
-    assert (
-        modified_file.getvalue() != protected_file.getvalue()
-    ), "Modification should not affect the protected PDF."
+INSERT_IMAGE_CASES = (
+    # img_name, expected_pdf, image_filter, compress, h
+    pytest.param(
+        "insert_images_insert_jpg.jpg",
+        "image_types_insert_jpg.pdf",
+        "AUTO",
+        False,
+        140,
+        id="jpg",
+    ),
+    # Pillow uses libjpeg-turbo on Windows and libjpeg elsewhere,
+    # leading to a slightly different image being parsed and included in the PDF:
+    pytest.param(
+        "insert_images_insert_jpg.jpg",
+        "image_types_insert_jpg_flatedecode.pdf",
+        "FlateDecode",
+        False,
+        140,
+        id="jpg_flatedecode",
+        marks=pytest.mark.skipif(ON_WINDOWS, reason="libjpeg-turbo under Windows"),
+    ),
+    pytest.param(
+        "insert_images_insert_jpg.jpg",
+        "image_types_insert_jpg_flatedecode_windows.pdf",
+        "FlateDecode",
+        False,
+        140,
+        id="jpg_flatedecode_windows",
+        marks=pytest.mark.skipif(not ON_WINDOWS, reason="libjpeg outside Windows"),
+    ),
+    pytest.param(
+        "insert_images_insert_jpg.jpg",
+        "image_types_insert_jpg_lzwdecode.pdf",
+        "LZWDecode",
+        False,
+        140,
+        id="jpg_lzwdecode",
+        marks=pytest.mark.skipif(ON_WINDOWS, reason="libjpeg-turbo under Windows"),
+    ),
+    pytest.param(
+        "insert_images_insert_jpg.jpg",
+        "image_types_insert_jpg_lzwdecode_windows.pdf",
+        "LZWDecode",
+        False,
+        140,
+        id="jpg_lzwdecode_windows",
+        marks=pytest.mark.skipif(not ON_WINDOWS, reason="libjpeg outside Windows"),
+    ),
+    pytest.param(
+        "insert_images_insert_jpg_cmyk.jpg",
+        "images_types_insert_jpg_cmyk.pdf",
+        "AUTO",
+        False,
+        0,
+        id="jpg_cmyk",
+    ),
+    pytest.param(
+        "insert_images_insert_png.png",
+        "image_types_insert_png.pdf",
+        "AUTO",
+        True,
+        140,
+        id="png",
+    ),
+    pytest.param(
+        "../png_test_suite/basi0g01.png",
+        "image_types_insert_png_monochromatic.pdf",
+        "AUTO",
+        True,
+        140,
+        id="png_monochromatic",
+    ),
+    pytest.param(
+        "circle.bmp", "image_types_insert_bmp.pdf", "AUTO", False, 140, id="bmp"
+    ),
+    pytest.param(
+        "circle.gif", "image_types_insert_gif.pdf", "AUTO", False, 0, id="gif"
+    ),
+    pytest.param(
+        "test.tiff", "image_types_insert_tiff.pdf", "AUTO", True, 0, id="g4_tiff"
+    ),
+    pytest.param(
+        "insert_images_insert_tiff_cmyk.tiff",
+        "image_types_insert_tiff_cmyk.pdf",
+        "AUTO",
+        True,
+        0,
+        id="tiff_cmyk",
+    ),
+)
 
 
-def test_insert_jpg(tmp_path):
+@pytest.mark.parametrize(
+    "img_name, expected_pdf, image_filter, compress, h", INSERT_IMAGE_CASES
+)
+def test_insert_image(img_name, expected_pdf, image_filter, compress, h, tmp_path):
     pdf = fpdf.FPDF()
-    pdf.compress = False
+    pdf.compress = compress
+    pdf.set_image_filter(image_filter)
     pdf.add_page()
-    pdf.image(HERE / "insert_images_insert_jpg.jpg", x=15, y=15, h=140)
-    assert_pdf_equal(pdf, HERE / "image_types_insert_jpg.pdf", tmp_path)
+    pdf.image(HERE / img_name, x=15, y=15, h=h)
+    assert_pdf_equal(pdf, HERE / expected_pdf, tmp_path)
 
 
 @pytest.mark.skipif(
-    sys.platform in ("cygwin", "win32"),
+    ON_WINDOWS,
     reason="Required system libraries to generate JPEG2000 images are a PITA to install under Windows",
 )
 def test_insert_jpg_jpxdecode(tmp_path):
@@ -336,64 +405,6 @@ def test_insert_jpg_jpxdecode(tmp_path):
     assert_pdf_equal(pdf, HERE / "image_types_insert_jpg_jpxdecode.pdf", tmp_path)
 
 
-def test_insert_jpg_flatedecode(tmp_path):
-    pdf = fpdf.FPDF()
-    pdf.compress = False
-    pdf.set_image_filter("FlateDecode")
-    pdf.add_page()
-    pdf.image(HERE / "insert_images_insert_jpg.jpg", x=15, y=15, h=140)
-    if sys.platform in ("cygwin", "win32"):
-        # Pillow uses libjpeg-turbo on Windows and libjpeg elsewhere,
-        # leading to a slightly different image being parsed and included in the PDF:
-        assert_pdf_equal(
-            pdf, HERE / "image_types_insert_jpg_flatedecode_windows.pdf", tmp_path
-        )
-    else:
-        assert_pdf_equal(pdf, HERE / "image_types_insert_jpg_flatedecode.pdf", tmp_path)
-
-
-def test_insert_jpg_lzwdecode(tmp_path):
-    pdf = fpdf.FPDF()
-    pdf.compress = False
-    pdf.set_image_filter("LZWDecode")
-    pdf.add_page()
-    pdf.image(HERE / "insert_images_insert_jpg.jpg", x=15, y=15, h=140)
-    if sys.platform in ("cygwin", "win32"):
-        assert_pdf_equal(
-            pdf,
-            HERE / "image_types_insert_jpg_lzwdecode_windows.pdf",
-            tmp_path,
-        )
-    else:
-        assert_pdf_equal(
-            pdf,
-            HERE / "image_types_insert_jpg_lzwdecode.pdf",
-            tmp_path,
-        )
-
-
-def test_insert_jpg_cmyk(tmp_path):
-    pdf = fpdf.FPDF()
-    pdf.compress = False
-    pdf.add_page()
-    pdf.image(HERE / "insert_images_insert_jpg_cmyk.jpg", x=15, y=15)
-    assert_pdf_equal(pdf, HERE / "images_types_insert_jpg_cmyk.pdf", tmp_path)
-
-
-def test_insert_png(tmp_path):
-    pdf = fpdf.FPDF()
-    pdf.add_page()
-    pdf.image(HERE / "insert_images_insert_png.png", x=15, y=15, h=140)
-    assert_pdf_equal(pdf, HERE / "image_types_insert_png.pdf", tmp_path)
-
-
-def test_insert_png_monochromatic(tmp_path):
-    pdf = fpdf.FPDF()
-    pdf.add_page()
-    pdf.image(HERE / "../png_test_suite/basi0g01.png", x=15, y=15, h=140)
-    assert_pdf_equal(pdf, HERE / "image_types_insert_png_monochromatic.pdf", tmp_path)
-
-
 def test_transcode_monochrome_and_libtiff_support_custom_tags():
     # Fails under WSL on my computer (Lucas), with this error:
     #   AttributeError: module 'PIL._imaging' has no attribute 'libtiff_support_custom_tags'
@@ -437,7 +448,7 @@ def test_insert_png_alpha_dctdecode(tmp_path):
     pdf.image(
         HERE / "../png_images/ba2b2b6e72ca0e4683bb640e2d5572f8.png", x=15, y=15, h=140
     )
-    if sys.platform in ("cygwin", "win32"):
+    if ON_WINDOWS:
         # Pillow uses libjpeg-turbo on Windows and libjpeg elsewhere,
         # leading to a slightly different image being parsed and included in the PDF:
         assert_pdf_equal(
@@ -449,14 +460,6 @@ def test_insert_png_alpha_dctdecode(tmp_path):
         )
 
 
-def test_insert_bmp(tmp_path):
-    pdf = fpdf.FPDF()
-    pdf.compress = False
-    pdf.add_page()
-    pdf.image(HERE / "circle.bmp", x=15, y=15, h=140)
-    assert_pdf_equal(pdf, HERE / "image_types_insert_bmp.pdf", tmp_path)
-
-
 def test_insert_jpg_icc(tmp_path):
     pdf = fpdf.FPDF()
     pdf.add_page(format=(448, 498))
@@ -483,33 +486,24 @@ def test_insert_jpg_invalid_icc(caplog, tmp_path):
     assert_pdf_equal(pdf, HERE / "image_types_insert_jpg_icc_invalid.pdf", tmp_path)
 
 
-def test_insert_gif(tmp_path):
-    pdf = fpdf.FPDF()
-    pdf.compress = False
-    pdf.add_page()
-    pdf.image(HERE / "circle.gif", x=15, y=15)
-    assert_pdf_equal(pdf, HERE / "image_types_insert_gif.pdf", tmp_path)
-
-
-def test_insert_g4_tiff(tmp_path):
-    pdf = fpdf.FPDF()
-    pdf.add_page()
-    pdf.image(HERE / "test.tiff", x=15, y=15)
-    assert_pdf_equal(pdf, HERE / "image_types_insert_tiff.pdf", tmp_path)
+@pytest.fixture(scope="session")
+def insert_png_pil():
+    img = Image.open(HERE / "insert_images_insert_png.png")
+    # Decode the image once, which also releases the underlying file handle:
+    img.load()
+    return img
 
 
-def test_insert_tiff_cmyk(tmp_path):
-    pdf = fpdf.FPDF()
-    pdf.add_page()
-    pdf.image(HERE / "insert_images_insert_tiff_cmyk.tiff", x=15, y=15)
-    assert_pdf_equal(pdf, HERE / "image_types_insert_tiff_cmyk.pdf", tmp_path)
+@pytest.fixture(scope="session")
+def insert_png_bytes():
+    return (HERE / "insert_images_insert_png.png").read_bytes()
 
 
-def test_insert_pillow(tmp_path):
+def test_insert_pillow(insert_png_pil, tmp_path):
     pdf = fpdf.FPDF()
     pdf.add_page()
-    img = Image.open(HERE / "insert_images_insert_png.png")
-    pdf.image(img, x=15, y=15, h=140)
+    # Each test gets its own copy, in case FPDF.image() alters it:
+    pdf.image(insert_png_pil.copy(), x=15, y=15, h=140)
     assert_pdf_equal(pdf, HERE / "image_types_insert_png.pdf", tmp_path)
 
 
@@ -517,30 +511,30 @@ def test_insert_pillow_issue_139(tmp_path):
     pdf = fpdf.FPDF()
     pdf.add_page()
     font = ImageFont.truetype(f"{HERE}/../../fonts/DejaVuSans.ttf", 40)
+    # All 20 labels are drawn on a single atlas, then each tile is cropped from it:
+    atlas = Image.new(mode="RGB", size=(400, 500), color=(60, 255, 10))
+    draw = ImageDraw.Draw(atlas)
+    for y in range(5):
+        for x in range(4):
+            draw.text((x * 100 + 20, y * 100 + 20), f"{y}{x}", fill="black", font=font)
     for y in range(5):
         for x in range(4):
-            img = Image.new(mode="RGB", size=(100, 100), color=(60, 255, 10))
-            ImageDraw.Draw(img).text((20, 20), f"{y}{x}", fill="black", font=font)
+            img = atlas.crop((x * 100, y * 100, x * 100 + 100, y * 100 + 100))
             pdf.image(img, x=x * 50 + 5, y=y * 50 + 5, w=45)
     assert_pdf_equal(pdf, HERE / "insert_pillow_issue_139.pdf", tmp_path)
 
 
-def test_insert_bytesio(tmp_path):
+def test_insert_bytesio(insert_png_bytes, tmp_path):
     pdf = fpdf.FPDF()
     pdf.add_page()
-    img = Image.open(HERE / "insert_images_insert_png.png")
-    img_bytes = io.BytesIO()
-    img.save(img_bytes, "PNG")
+    img_bytes = io.BytesIO(insert_png_bytes)
     pdf.image(img_bytes, x=15, y=15, h=140)
     assert_pdf_equal(pdf, HERE / "image_types_insert_png.pdf", tmp_path)
     assert not img_bytes.closed  # cf. issue #881
 
 
-def test_insert_bytes(tmp_path):
+def test_insert_bytes(insert_png_bytes, tmp_path):
     pdf = fpdf.FPDF()
     pdf.add_page()
-    img = Image.open(HERE / "insert_images_insert_png.png")
-    img_bytes = io.BytesIO()
-    img.save(img_bytes, "PNG")
-    pdf.image(img_bytes.getvalue(), x=15, y=15, h=140)
+    pdf.image(insert_png_bytes, x=15, y=15, h=140)
     assert_pdf_equal(pdf, HERE / "image_types_insert_png.pdf", tmp_path)